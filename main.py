@@ -1,27 +1,37 @@
 import sys, getopt
-from src.process import detect_tables_and_lines, detect_tables_and_lines_v1
+from src.process import detect_tables_and_lines, detect_tables_and_lines_v1, SCOPE_CELLS, SCOPES, DETECTOR_SHAPES, DETECTORS
 
 def main(argv):
     inputfile = ''
+    scope     = SCOPE_CELLS
+    detector  = DETECTOR_SHAPES
     try:
         if len(argv) < 2:
-            print ('main.py -i <inputfile>')
+            print ('main.py -i <inputfile> [-s lines|extents|cells] [-d shapes|joints]')
             sys.exit()
         
-        opts, args = getopt.getopt(argv,"hi:",["ifile="])
+        opts, args = getopt.getopt(argv,"hi:s:d:",["ifile=","scope=","detector="])
     except getopt.GetoptError:
-        print ('main.py -i <inputfile>')
+        print ('main.py -i <inputfile> [-s lines|extents|cells] [-d shapes|joints]')
         sys.exit(2)
     
     for opt, arg in opts:
         if opt == '-h':
-            print ('main.py -i <inputfile>')
+            print ('main.py -i <inputfile> [-s lines|extents|cells] [-d shapes|joints]')
             sys.exit()
         elif opt in ("-i", "--ifile"):
             inputfile = arg
+        elif opt in ("-s", "--scope"):
+            scope = arg
+        elif opt in ("-d", "--detector"):
+            detector = arg
+
+    if scope not in SCOPES or detector not in DETECTORS:
+        print ('main.py -i <inputfile> [-s lines|extents|cells] [-d shapes|joints]')
+        sys.exit(2)
     print('received inputfile [%s]' % (inputfile))
 
-    tables, lines = detect_tables_and_lines_v1(inputfile)
+    tables, lines = detect_tables_and_lines_v1(inputfile, scope=scope, detector=detector)
     
     print(tables)
     print(lines)
@@ -1,11 +1,20 @@
 import cv2
 import numpy as np
 import os
+from . import segments
+from .params import ENGINE_MASK, ENGINE_SEGMENTS
 
 class ExtractTable:
     def __init__(self, filepath, debug=False):
         self.filepath   = filepath
         self.debug      = debug
+        self.image      = None
+
+    # Reads the source image once, every table crop is taken from it.
+    def getImage(self):
+        if self.image is None:
+            self.image  = cv2.imread(self.filepath, cv2.IMREAD_COLOR)
+        return self.image
 
     def sort_contours(self, cnts, method="left-to-right"):
         reverse = False
@@ -52,10 +61,10 @@ class ExtractTable:
 
         return rect, possible_table_joints
 
-    def getTablesV1(self):
+    def getTablesV1(self, engine=ENGINE_MASK):
         rects           = []
         if os.path.exists(self.filepath):
-            src_img                 = cv2.imread(self.filepath, cv2.IMREAD_COLOR)
+            src_img                 = self.getImage()
             gray                    = cv2.cvtColor(src_img, cv2.COLOR_BGR2GRAY)
             MAX_THRESHOLD_VALUE     = 255
             BLOCK_SIZE              = 15
@@ -75,20 +84,23 @@ class ExtractTable:
             vertical_structure      = cv2.getStructuringElement(cv2.MORPH_RECT, (1, vertical_size))
             self.isolate_lines(vertical, vertical_structure)
 
-            mask                    = horizontal + vertical
-            contours                = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            contours                = contours[0] if len(contours) == 2 else contours[1]
-            intersections           = cv2.bitwise_and(horizontal, vertical)
-
-            if self.debug:
-                print('V1: total contours found %d' % ( len(contours) ))
-
-            tables                  = []
-            for i in range(len(contours)):
-                (rect, table_joints) = self.verify_table(contours[i], intersections)
-                if rect == None or table_joints == None:
-                    continue
-                rects.append(rect)
+            if engine == ENGINE_SEGMENTS:
+                for (rect, table_joints) in segments.find_table_joints(horizontal, vertical):
+                    rects.append(rect)
+            else:
+                mask                    = horizontal + vertical
+                contours                = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+                contours                = contours[0] if len(contours) == 2 else contours[1]
+                intersections           = cv2.bitwise_and(horizontal, vertical)
+
+                if self.debug:
+                    print('V1: total contours found %d' % ( len(contours) ))
+
+                for i in range(len(contours)):
+                    (rect, table_joints) = self.verify_table(contours[i], intersections)
+                    if rect == None or table_joints == None:
+                        continue
+                    rects.append(rect)
         if self.debug:
             print('V1: found %d tables' % (len(rects)))
         return rects
@@ -96,7 +108,7 @@ class ExtractTable:
     def getTables(self):
         rects           = []
         if os.path.exists(self.filepath):
-            src_img     = cv2.imread(self.filepath, cv2.IMREAD_COLOR)
+            src_img     = self.getImage()
             blur_img    = cv2.pyrMeanShiftFiltering(src_img, 11, 21)
             gray_img    = cv2.cvtColor(blur_img, cv2.COLOR_BGR2GRAY)
             bw_img      = cv2.adaptiveThreshold(gray_img, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 15, -2)
@@ -119,7 +131,7 @@ class ExtractTable:
 
     def getTableImage(self, rect):
         EXTRA_PIXEL = 20
-        img      = cv2.imread(self.filepath, cv2.IMREAD_COLOR)
+        img      = self.getImage()
         x,y,w,h  = rect
         crop     = img[y-EXTRA_PIXEL:y-EXTRA_PIXEL+h+2*EXTRA_PIXEL, x-EXTRA_PIXEL:x-EXTRA_PIXEL+w+2*EXTRA_PIXEL]
         return crop
@@ -151,14 +163,14 @@ class ExtractTable:
         # Eroding and thesholding the image
         img_vh              = cv2.erode(~img_vh, kernel, iterations=2)
         thresh, img_vh      = cv2.threshold(img_vh, 128, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
-        bitxor              = cv2.bitwise_xor(gray_img, img_vh)
-        bitnot              = cv2.bitwise_not(bitxor)
         
         # Detect contours for following box detection
         contours            = cv2.findContours(img_vh, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
         contours            = contours[0] if len(contours) == 2 else contours[1]
         if self.debug:
             print('total contours found %d' % ( len(contours) ))
+        if len(contours) == 0:
+            return []
 
         # Sort all the contours by top to bottom.
         contours, boundingBoxes = self.sort_contours(contours, method="top-to-bottom")
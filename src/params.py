@@ -0,0 +1,22 @@
+ENGINE_MASK         = 'mask'        # table joints from contours of the intersection mask
+ENGINE_SEGMENTS     = 'segments'    # table joints from crossings of the line segments
+
+class DetectionParams:
+    def __init__(self, block_size=15, threshold_constant=0, scale=15, length=50, max_threshold_value=255, engine=ENGINE_MASK):
+        self.block_size             = block_size            # neighbourhood size of the adaptive threshold, must be odd
+        self.threshold_constant     = threshold_constant    # constant subtracted from the neighbourhood mean
+        self.scale                  = scale                 # structuring element length is image size / scale
+        self.length                 = length                # min width of a horizontal line
+        self.max_threshold_value    = max_threshold_value
+        self.engine                 = engine                # how table joints are found
+
+    def __str__(self):
+        return "(block_size: %d, threshold_constant: %d, scale: %d, length: %d)" % (self.block_size, self.threshold_constant, self.scale, self.length)
+
+    # Length of the horizontal structuring element for an image of the given width.
+    def horizontal_size(self, width):
+        return int(width / self.scale)
+
+    # Length of the vertical structuring element for an image of the given height.
+    def vertical_size(self, height):
+        return int(height / self.scale)
@@ -3,11 +3,31 @@ import numpy as np
 from .table import Table
 from . import utils
 from .extracttable import ExtractTable
+from . import segments
+from .params import DetectionParams, ENGINE_SEGMENTS, ENGINE_MASK
+
+"""
+Output scope of detect_tables_and_lines_v1. Every scope starts from the same
+candidate tables, they only differ in how far the candidates are verified
+"""
+SCOPE_LINES     = 'lines'       # horizontal lines outside tables, no tables returned
+SCOPE_EXTENTS   = 'extents'     # lines and the bounding rect of every candidate table
+SCOPE_CELLS     = 'cells'       # lines and each candidate table with cells, with its cell rects
+SCOPES          = (SCOPE_LINES, SCOPE_EXTENTS, SCOPE_CELLS)
+
+"""
+How detect_tables_and_lines_v1 finds the candidate tables
+"""
+DETECTOR_SHAPES = 'shapes'      # 4-sided contours of the mean shift filtered page (ExtractTable.getTables)
+DETECTOR_JOINTS = 'joints'      # line mask contours with at least 5 joints, from the same threshold as the lines
+DETECTORS       = (DETECTOR_SHAPES, DETECTOR_JOINTS)
 
 def process_tables_v1(filepath):
     TableMgr                = ExtractTable(filepath)
-    tables                  = TableMgr.getTables()    
-    print('probably found %d tables in %s, need to check rows and cols' % (len(tables), filepath))
+    return table_cells_v1(TableMgr, TableMgr.getTables())
+
+def table_cells_v1(TableMgr, tables):
+    print('probably found %d tables in %s, need to check rows and cols' % (len(tables), TableMgr.filepath))
     table_info              = []
 
     for table in tables:
@@ -38,27 +58,39 @@ def process_tables_v1(filepath):
 
     return table_info
 
-def process_tables(filepath):
-    img                     = cv2.imread(filepath)
-    gray                    = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-    MAX_THRESHOLD_VALUE     = 255
-    BLOCK_SIZE              = 15
-    THRESHOLD_CONSTANT      = 0
-    SCALE                   = 15
-
-    # Filter image
-    filtered                = cv2.adaptiveThreshold(~gray, MAX_THRESHOLD_VALUE, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, BLOCK_SIZE, THRESHOLD_CONSTANT)
+"""
+Returns the y-range of the candidate tables that contain at least one of the
+given lines and have cells, which are the tables the cells scope would use to
+remove those lines. Candidates without a line in their y-range cannot remove
+a line, so their cells are never looked for.
+"""
+def table_extents_v1(TableMgr, tables, lines):
+    table_coordinates       = []
+    for table in tables:
+        y1, y2              = table[1], table[1] + table[3]
+        if not any(l[1] >= y1 and l[1] <= y2 for l in lines):
+            continue
+        if len(TableMgr.getTableRects(table)) > 0:
+            table_coordinates.append((y1, y2))
+    return table_coordinates
 
-    horizontal              = filtered.copy()
-    horizontal_size         = int(horizontal.shape[1] / SCALE)
-    horizontal_structure    = cv2.getStructuringElement(cv2.MORPH_RECT, (horizontal_size, 1))
-    utils.isolate_lines(horizontal, horizontal_structure)
+def threshold_image(gray, params):
+    return cv2.adaptiveThreshold(~gray, params.max_threshold_value, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, params.block_size, params.threshold_constant)
 
-    vertical                = filtered.copy()
-    vertical_size           = int(vertical.shape[0] / SCALE)
-    vertical_structure      = cv2.getStructuringElement(cv2.MORPH_RECT, (1, vertical_size))
-    utils.isolate_lines(vertical, vertical_structure)
+"""
+line_rects are the rects of find_line_rects(horizontal) when they are already
+known, the segments engine then does not trace the horizontal mask again.
+"""
+def find_tables(horizontal, vertical, engine=ENGINE_MASK, line_rects=None):
+    if engine == ENGINE_SEGMENTS:
+        tables              = []
+        for (rect, joint_coords) in segments.find_table_joints(horizontal, vertical, line_rects):
+            table           = Table(rect[0], rect[1], rect[2], rect[3])
+            table.set_joints(joint_coords)
+            tables.append(table)
+        return tables
+    if engine != ENGINE_MASK:
+        raise ValueError("Invalid engine %s, expected %s or %s." % (engine, ENGINE_SEGMENTS, ENGINE_MASK))
 
     mask                    = horizontal + vertical
     contours                = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -83,38 +115,94 @@ def process_tables(filepath):
         tables.append(table)
     return tables
 
-def process_lines(filepath, length=50):
+def find_line_rects(horizontal):
+    contours                = cv2.findContours(horizontal, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    contours                = contours[0] if len(contours) == 2 else contours[1]
+    return [cv2.boundingRect(contour) for contour in contours]
+
+def filter_lines(rects, length):
+    return [(x,y,w,h) for (x,y,w,h) in rects if w > length]
+
+def lines_outside_tables(lines, table_coordinates):
+    lines_coordinates = []
+    for l in lines:
+        within_table = False
+
+        for index, table_coordinate in enumerate(table_coordinates):
+            if l[1] >= table_coordinate[0] and l[1] <= table_coordinate[1]:
+                within_table = True
+                break
+        if within_table == False:
+            lines_coordinates.append(l)
+    return lines_coordinates
+
+def process_tables(filepath, params=None):
+    params                  = params or DetectionParams()
+    img                     = cv2.imread(filepath)
+    gray                    = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+    # Filter image
+    filtered                = threshold_image(gray, params)
+
+    horizontal              = filtered.copy()
+    horizontal_structure    = utils.line_structure(params.horizontal_size(horizontal.shape[1]), horizontal=True)
+    utils.isolate_lines(horizontal, horizontal_structure)
+
+    vertical                = filtered.copy()
+    vertical_structure      = utils.line_structure(params.vertical_size(vertical.shape[0]), horizontal=False)
+    utils.isolate_lines(vertical, vertical_structure)
+
+    return find_tables(horizontal, vertical, params.engine)
+
+def process_lines(filepath, length=None, params=None):
+    params                  = params or DetectionParams()
+    length                  = params.length if length is None else length
     img                     = cv2.imread(filepath)
     gray                    = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
-    MAX_THRESHOLD_VALUE     = 255
-    BLOCK_SIZE              = 15
-    THRESHOLD_CONSTANT      = 0
-    SCALE                   = 15
+    # Filter image
+    filtered                = threshold_image(gray, params)
+    horizontal              = filtered.copy()
+    horizontal_structure    = utils.line_structure(params.horizontal_size(horizontal.shape[1]), horizontal=True)
+    utils.isolate_lines(horizontal, horizontal_structure)
+
+    return filter_lines(find_line_rects(horizontal), length)
+
+"""
+Finds the tables and the horizontal lines from a single thresholded image,
+the horizontal opening is shared by both. A table is verified by its joints
+only, the cells are not looked for.
+"""
+def process_tables_and_lines(filepath, params=None):
+    params                  = params or DetectionParams()
+    img                     = cv2.imread(filepath)
+    gray                    = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
     # Filter image
-    filtered                = cv2.adaptiveThreshold(~gray, MAX_THRESHOLD_VALUE, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, BLOCK_SIZE, THRESHOLD_CONSTANT)
+    filtered                = threshold_image(gray, params)
+
     horizontal              = filtered.copy()
-    horizontal_size         = int(horizontal.shape[1] / SCALE)
-    horizontal_structure    = cv2.getStructuringElement(cv2.MORPH_RECT, (horizontal_size, 1))
+    horizontal_structure    = utils.line_structure(params.horizontal_size(horizontal.shape[1]), horizontal=True)
     utils.isolate_lines(horizontal, horizontal_structure)
 
-    contours                = cv2.findContours(horizontal, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    contours                = contours[0] if len(contours) == 2 else contours[1]
+    vertical                = filtered
+    vertical_structure      = utils.line_structure(params.vertical_size(vertical.shape[0]), horizontal=False)
+    utils.isolate_lines(vertical, vertical_structure)
 
-    # filtered_contours       = []
-    lines                   = []
+    line_rects              = find_line_rects(horizontal)
+    tables                  = find_tables(horizontal, vertical, params.engine, line_rects)
+    lines                   = filter_lines(line_rects, params.length)
+    return tables, lines
 
-    for index, contour in enumerate(contours):
-        x, y, w, h = cv2.boundingRect(contour)
-        if w > length:
-            # filtered_contours.append(contour)
-            lines.append((x,y,w,h))
-    return lines
+def find_candidates_and_lines(TableMgr, params, detector):
+    if detector == DETECTOR_JOINTS:
+        tables, lines       = process_tables_and_lines(TableMgr.filepath, params)
+        return [(t.x, t.y, t.w, t.h) for t in tables], lines
+    return TableMgr.getTables(), process_lines(TableMgr.filepath, params=params)
 
-def detect_tables_and_lines(filepath):
-    ts = process_tables(filepath)
-    ls = process_lines(filepath)
+def detect_tables_and_lines(filepath, params=None):
+    ts = process_tables(filepath, params)
+    ls = process_lines(filepath, params=params)
 
     table_coordinates = []
     lines_coordinates = []
@@ -142,29 +230,32 @@ def detect_tables_and_lines(filepath):
     return tables, lines
 
 
-def detect_tables_and_lines_v1(filepath):
-    ts          = process_tables_v1(filepath)
-    ls          = process_lines(filepath)
-
-    table_coordinates = []
-    lines_coordinates = []
-    for t in ts:
-        table_coordinates.append((t['table']['y'], t['table']['y'] + t['table']['h']))
+def detect_tables_and_lines_v1(filepath, params=None, scope=SCOPE_CELLS, detector=DETECTOR_SHAPES):
+    if scope not in SCOPES:
+        raise ValueError("Invalid scope %s, expected one of %s." % (scope, ', '.join(SCOPES)))
+    if detector not in DETECTORS:
+        raise ValueError("Invalid detector %s, expected one of %s." % (detector, ', '.join(DETECTORS)))
 
-    for l in ls:
-        within_table = False
+    TableMgr                = ExtractTable(filepath)
+    candidates, ls          = find_candidates_and_lines(TableMgr, params, detector)
 
-        for index, table_coordinate in enumerate(table_coordinates):
-            # print('Rect Y1: %d <= line y1: %d <= Rect Y2: %d' % (table_coordinate[0], l[1], table_coordinate[1]))
-            if l[1] >= table_coordinate[0] and l[1] <= table_coordinate[1]:
-                # print('line x1: %d, y: %d, is within table index %d' % (l[0], l[1], index))
-                within_table = True
-                break
-        if within_table == False:
-            lines_coordinates.append(l)
+    if scope == SCOPE_CELLS:
+        ts                  = table_cells_v1(TableMgr, candidates)
+        table_coordinates   = []
+        for t in ts:
+            table_coordinates.append((t['table']['y'], t['table']['y'] + t['table']['h']))
+    elif scope == SCOPE_EXTENTS:
+        ts                  = []
+        table_coordinates   = []
+        for t in candidates:
+            ts.append({'table': {'x': t[0], 'y': t[1], 'w': t[2], 'h': t[3]}})
+            table_coordinates.append((t[1], t[1] + t[3]))
+    else:
+        ts                  = []
+        table_coordinates   = table_extents_v1(TableMgr, candidates, ls)
 
     lines  = []
-    for l in lines_coordinates:
+    for l in lines_outside_tables(ls, table_coordinates):
         lines.append({'x': l[0], 'y': l[1], 'w': l[2], 'h': l[3]})
 
     return ts, lines
\ No newline at end of file
@@ -0,0 +1,202 @@
+import cv2
+import numpy as np
+
+MIN_TABLE_AREA      = 50        # min table area to be considered a table
+MIN_TABLE_JOINTS    = 5         # min number of joints to be considered a table
+
+"""
+Finds the line segments in a mask of isolated lines.
+Returns an (n, 4) array with x1, y1, x2, y2 of the bounding rect of each
+segment, x2 and y2 are exclusive.
+"""
+def extract_segments(mask):
+    contours    = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    contours    = contours[0] if len(contours) == 2 else contours[1]
+    return rects_to_segments([cv2.boundingRect(contour) for contour in contours])
+
+"""
+Converts x, y, w, h rects, as returned by find_line_rects,
+to the segment array of extract_segments.
+"""
+def rects_to_segments(rects):
+    if len(rects) == 0:
+        return np.empty((0, 4), dtype=np.int64)
+
+    rects       = np.asarray(rects, dtype=np.int64)
+    return np.stack((rects[:, 0], rects[:, 1], rects[:, 0] + rects[:, 2], rects[:, 1] + rects[:, 3]), axis=1)
+
+"""
+Finds the pairs of horizontal and vertical segments that touch or cross.
+The verticals are sorted by x1 once, so for every horizontal segment only the
+verticals starting within its x-range (widened by the widest vertical) are
+compared, all horizontals at once.
+Returns the index arrays (horizontal, vertical) of the touching pairs.
+"""
+def find_crossings(horizontals, verticals):
+    if len(horizontals) == 0 or len(verticals) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    order       = np.argsort(verticals[:, 0], kind='stable')
+    sorted_v    = verticals[order]
+    max_width   = (sorted_v[:, 2] - sorted_v[:, 0]).max()
+    lo          = np.searchsorted(sorted_v[:, 0], horizontals[:, 0] - max_width, side='left')
+    hi          = np.searchsorted(sorted_v[:, 0], horizontals[:, 2], side='right')
+
+    # Expand every horizontal into its candidate pairs
+    counts      = hi - lo
+    h_index     = np.repeat(np.arange(len(horizontals)), counts)
+    offsets     = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+    v_position  = np.arange(counts.sum()) + offsets
+
+    h           = horizontals[h_index]
+    v           = sorted_v[v_position]
+    touching    = (h[:, 0] <= v[:, 2]) & (v[:, 0] <= h[:, 2]) & (h[:, 1] <= v[:, 3]) & (v[:, 1] <= h[:, 3])
+    return h_index[touching], order[v_position[touching]]
+
+"""
+Labels the connected components of a graph with count nodes
+and the edges (first[i], second[i]).
+Every node points to a node with a lower or equal index. Each pass hooks the
+root of one end of every edge to the label of the other end, keeping the
+lowest, then shortcuts the pointers to the roots, until no edge joins two
+different roots.
+"""
+def label_components(count, first, second):
+    labels  = np.arange(count, dtype=np.int64)
+    first   = np.asarray(first, dtype=np.int64)
+    second  = np.asarray(second, dtype=np.int64)
+    while True:
+        hooked  = labels.copy()
+        np.minimum.at(hooked, labels[first], labels[second])
+        np.minimum.at(hooked, labels[second], labels[first])
+        while True:
+            jumped  = hooked[hooked]
+            if (jumped == hooked).all():
+                break
+            hooked  = jumped
+        if (hooked == labels).all():
+            return labels
+        labels  = hooked
+
+"""
+Finds the pixels where both masks are set inside each crossing rect.
+All the rects are read at once, padded to the largest one.
+Returns a bool array telling which rects have such pixels, the first of
+those pixels in raster order (x, y) and their bounding rect (x1, y1, x2, y2).
+"""
+def crossing_pixels(crossing, horizontal, vertical):
+    height      = (crossing[:, 3] - crossing[:, 1]).max()
+    width       = (crossing[:, 2] - crossing[:, 0]).max()
+    ys          = crossing[:, 1, None, None] + np.arange(height)[None, :, None]
+    xs          = crossing[:, 0, None, None] + np.arange(width)[None, None, :]
+    inside      = (ys < crossing[:, 3, None, None]) & (xs < crossing[:, 2, None, None])
+    ys          = np.minimum(ys, crossing[:, 3, None, None] - 1)
+    xs          = np.minimum(xs, crossing[:, 2, None, None] - 1)
+    pixels      = inside & (horizontal[ys, xs] > 0) & (vertical[ys, xs] > 0)
+
+    flat        = pixels.reshape(len(crossing), -1)
+    found       = flat.any(axis=1)
+    first       = flat.argmax(axis=1)
+    first       = np.stack((crossing[:, 0] + first % width, crossing[:, 1] + first // width), axis=1)
+
+    rows        = pixels.any(axis=2)
+    cols        = pixels.any(axis=1)
+    bounds      = np.stack((crossing[:, 0] + cols.argmax(axis=1), crossing[:, 1] + rows.argmax(axis=1),
+                            crossing[:, 0] + width - cols[:, ::-1].argmax(axis=1), crossing[:, 1] + height - rows[:, ::-1].argmax(axis=1)), axis=1)
+    return found, first, bounds
+
+"""
+Pairs up the crossings of the same segment that touch.
+The crossings are sorted by owner (the segment index) and by their start
+along the segment, so only neighbours in that order are compared; axis is 0
+for horizontal segments and 1 for vertical ones.
+"""
+def touching_neighbours(crossing, owner, axis):
+    other       = 1 - axis
+    order       = np.lexsort((crossing[:, axis], owner))
+    a, b        = order[:-1], order[1:]
+    touching    = ((owner[a] == owner[b]) & (crossing[b, axis] <= crossing[a, axis + 2]) &
+                   (crossing[b, other] <= crossing[a, other + 2]) & (crossing[a, other] <= crossing[b, other + 2]))
+    return a[touching], b[touching]
+
+"""
+Finds the tables formed by the isolated horizontal and vertical lines.
+Crossing segments are grouped into table candidates, crossings whose
+pixels touch are clustered into joints. A candidate is a table if its area
+is at least MIN_TABLE_AREA and it has at least MIN_TABLE_JOINTS joints.
+horizontal_rects are the x, y, w, h rects of the horizontal mask when they
+are already known (find_line_rects), so that mask is not traced again.
+
+Returns a list of (rect, joints) with rect as x, y, w, h and joints as an
+(n, 2) array of x, y relative to the rect, sorted by y then x. Like the
+joints found by findContours on the intersections, each joint is the
+first pixel in raster order where both masks are set.
+"""
+def find_table_joints(horizontal, vertical, horizontal_rects=None):
+    if horizontal_rects is None:
+        horizontals     = extract_segments(horizontal)
+    else:
+        horizontals     = rects_to_segments(horizontal_rects)
+    if len(horizontals) == 0:
+        return []
+
+    verticals           = extract_segments(vertical)
+    h_index, v_index    = find_crossings(horizontals, verticals)
+    if len(h_index) == 0:
+        return []
+
+    # Table candidates are the groups of segments connected by crossings
+    segments            = np.concatenate((horizontals, verticals))
+    groups              = label_components(len(segments), h_index, v_index + len(horizontals))
+
+    # The area shared by the bounding rects of both segments of each crossing,
+    # only the crossings with pixels set in both masks inside it make a joint
+    h                   = horizontals[h_index]
+    v                   = verticals[v_index]
+    crossing            = np.stack((np.maximum(h[:, 0], v[:, 0]), np.maximum(h[:, 1], v[:, 1]),
+                                    np.minimum(h[:, 2], v[:, 2]), np.minimum(h[:, 3], v[:, 3])), axis=1)
+    overlapping         = (crossing[:, 0] < crossing[:, 2]) & (crossing[:, 1] < crossing[:, 3])
+    h_index, v_index    = h_index[overlapping], v_index[overlapping]
+    if len(h_index) == 0:
+        return []
+
+    found, first, bounds = crossing_pixels(crossing[overlapping], horizontal, vertical)
+    h_index, v_index    = h_index[found], v_index[found]
+    first, bounds       = first[found], bounds[found]
+    crossing_groups     = groups[h_index]
+
+    # Crossings whose pixels touch form a single joint, two crossings can
+    # only touch when they share their horizontal or their vertical segment
+    h_first, h_second   = touching_neighbours(bounds, h_index, 0)
+    v_first, v_second   = touching_neighbours(bounds, v_index, 1)
+    clusters            = label_components(len(bounds), np.concatenate((h_first, v_first)), np.concatenate((h_second, v_second)))
+
+    # The joint of each cluster is the first of its crossings' first pixels
+    sorted_indices      = np.lexsort((first[:, 0], first[:, 1], clusters))
+    _, first_indices    = np.unique(clusters[sorted_indices], return_index=True)
+    joint_indices       = sorted_indices[first_indices]
+    joints              = first[joint_indices]
+    joint_groups        = crossing_groups[joint_indices]
+
+    # Bounding rect of every group, groups are labelled by a segment index
+    top_left            = np.full((len(segments), 2), np.iinfo(np.int64).max, dtype=np.int64)
+    bottom_right        = np.zeros((len(segments), 2), dtype=np.int64)
+    np.minimum.at(top_left, groups, segments[:, :2])
+    np.maximum.at(bottom_right, groups, segments[:, 2:])
+
+    # Joints sorted by group, then y, then x, so each table is one slice
+    sorted_indices      = np.lexsort((joints[:, 0], joints[:, 1], joint_groups))
+    joints              = joints[sorted_indices]
+    joint_groups        = joint_groups[sorted_indices]
+    table_groups, starts, counts = np.unique(joint_groups, return_index=True, return_counts=True)
+
+    tables              = []
+    for group, start, count in zip(table_groups, starts, counts):
+        x1, y1          = top_left[group]
+        x2, y2          = bottom_right[group]
+        if (x2 - x1) * (y2 - y1) < MIN_TABLE_AREA or count < MIN_TABLE_JOINTS:
+            continue
+
+        table_joints    = joints[start:start + count] - (x1, y1)
+        tables.append(((int(x1), int(y1), int(x2 - x1), int(y2 - y1)), table_joints))
+    return tables
@@ -0,0 +1,110 @@
+import time
+import itertools
+import cv2
+from . import utils
+from .params import DetectionParams, ENGINE_MASK
+from .process import threshold_image, find_tables, find_line_rects, filter_lines, lines_outside_tables
+
+"""
+Evaluate every combination of the detection parameters over a corpus of images.
+
+The adaptive threshold is computed once per (block_size, threshold_constant) and shared
+by all scales, the openings for all scales are built incrementally from that one thresholded
+image, tables are detected once per scale and the line length is only a filter over the
+line rects found for that scale.
+
+ground_truth is an optional dict of filepath -> {'tables': n, 'lines': n}, when given the
+accuracy column is the fraction of those images whose table and line counts both match.
+
+Returns one row (dict) per setting; seconds is the time spent on the setting over the
+whole corpus, with the work shared between settings split evenly among them.
+"""
+def sweep(filepaths, block_sizes=(15,), threshold_constants=(0,), scales=(15,), lengths=(50,), ground_truth=None, engine=ENGINE_MASK):
+    block_sizes         = unique_values(block_sizes)
+    threshold_constants = unique_values(threshold_constants)
+    scales              = unique_values(scales)
+    lengths             = unique_values(lengths)
+
+    results     = {}
+    for params in iterate_params(block_sizes, threshold_constants, scales, lengths):
+        results[settings_key(params)] = {
+            'block_size'            : params.block_size,
+            'threshold_constant'    : params.threshold_constant,
+            'scale'                 : params.scale,
+            'length'                : params.length,
+            'seconds'               : 0.0,
+            'tables'                : 0,
+            'lines'                 : 0,
+            'matched'               : 0
+        }
+
+    settings_per_threshold = len(scales) * len(lengths)
+    evaluated   = 0
+    for filepath in filepaths:
+        img                     = cv2.imread(filepath)
+        gray                    = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        expected                = ground_truth.get(filepath) if ground_truth else None
+        if expected is not None:
+            evaluated           += 1
+
+        for block_size, threshold_constant in itertools.product(block_sizes, threshold_constants):
+            start               = time.time()
+            filtered            = threshold_image(gray, DetectionParams(block_size, threshold_constant))
+
+            horizontal_sizes    = dict((scale, DetectionParams(scale=scale).horizontal_size(filtered.shape[1])) for scale in scales)
+            vertical_sizes      = dict((scale, DetectionParams(scale=scale).vertical_size(filtered.shape[0])) for scale in scales)
+            horizontals         = utils.incremental_openings(filtered, horizontal_sizes.values(), horizontal=True)
+            verticals           = utils.incremental_openings(filtered, vertical_sizes.values(), horizontal=False)
+            shared              = (time.time() - start) / settings_per_threshold
+
+            for scale in scales:
+                start               = time.time()
+                horizontal          = horizontals[horizontal_sizes[scale]]
+                line_rects          = find_line_rects(horizontal)
+                tables              = find_tables(horizontal, verticals[vertical_sizes[scale]], engine, line_rects)
+                table_coordinates   = [(t.y, t.y + t.h) for t in tables]
+                per_scale           = (time.time() - start) / len(lengths)
+
+                for length in lengths:
+                    start           = time.time()
+                    lines           = lines_outside_tables(filter_lines(line_rects, length), table_coordinates)
+                    elapsed         = time.time() - start
+
+                    row             = results[(block_size, threshold_constant, scale, length)]
+                    row['seconds']  += shared + per_scale + elapsed
+                    row['tables']   += len(tables)
+                    row['lines']    += len(lines)
+                    if expected is not None and expected['tables'] == len(tables) and expected['lines'] == len(lines):
+                        row['matched'] += 1
+
+    rows        = []
+    for row in results.values():
+        matched = row.pop('matched')
+        row['accuracy'] = float(matched) / evaluated if evaluated > 0 else None
+        rows.append(row)
+    return rows
+
+# Drops repeated values, keeping the order of the first occurrences.
+def unique_values(values):
+    unique = []
+    for value in values:
+        if value not in unique:
+            unique.append(value)
+    return unique
+
+def iterate_params(block_sizes, threshold_constants, scales, lengths):
+    for block_size, threshold_constant, scale, length in itertools.product(block_sizes, threshold_constants, scales, lengths):
+        yield DetectionParams(block_size, threshold_constant, scale, length)
+
+def settings_key(params):
+    return (params.block_size, params.threshold_constant, params.scale, params.length)
+
+"""
+Prints the sweep rows as a table, fastest setting first.
+"""
+def print_sweep(rows):
+    print('%10s %10s %6s %6s %10s %7s %7s %9s' % ('block_size', 'constant', 'scale', 'length', 'seconds', 'tables', 'lines', 'accuracy'))
+    for row in sorted(rows, key=lambda r: r['seconds']):
+        accuracy = '-' if row['accuracy'] is None else '%.3f' % (row['accuracy'])
+        print('%10d %10d %6d %6d %10.3f %7d %7d %9s' % (row['block_size'], row['threshold_constant'], row['scale'], row['length'],
+                                                        row['seconds'], row['tables'], row['lines'], accuracy))
@@ -7,6 +7,38 @@ def isolate_lines(src, structuring_element):
 	cv2.erode(src, structuring_element, src, (-1, -1)) # makes white spots smaller
 	cv2.dilate(src, structuring_element, src, (-1, -1)) # makes white spots bigger
 
+"""
+Rectangular structuring element of the given length,
+laid out along a row (horizontal) or a column (vertical)
+"""
+def line_structure(size, horizontal=True):
+    if horizontal:
+        return cv2.getStructuringElement(cv2.MORPH_RECT, (size, 1))
+    return cv2.getStructuringElement(cv2.MORPH_RECT, (1, size))
+
+"""
+Open src with a line structuring element of every length in sizes,
+returns a dict of length -> opened image.
+The erosion for each length is built on top of the erosion for the
+previous (smaller) length: eroding by a then by b is the same as eroding
+by a + b - 1, so only the difference has to be applied. The anchor of each
+step keeps the combined element centred, which makes every result equal
+to isolate_lines with a fresh element of that length.
+"""
+def incremental_openings(src, sizes, horizontal=True):
+    openings    = {}
+    eroded      = src
+    previous    = 1
+    for size in sorted(set(sizes)):
+        step        = size - previous + 1
+        if step > 1:
+            offset  = size // 2 - previous // 2
+            anchor  = (offset, 0) if horizontal else (0, offset)
+            eroded  = cv2.erode(eroded, line_structure(step, horizontal), anchor=anchor)
+        openings[size]  = cv2.dilate(eroded, line_structure(size, horizontal))
+        previous        = size
+    return openings
+
 """
 Verify if the region inside a contour is a table
 If it is a table, returns the bounding rect
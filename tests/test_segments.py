@@ -0,0 +1,69 @@
+import pytest
+
+np  = pytest.importorskip('numpy')
+cv2 = pytest.importorskip('cv2')
+
+from src import process, utils, segments
+from src.params import DetectionParams, ENGINE_MASK, ENGINE_SEGMENTS
+
+# Two bordered tables on a 1700x2200 page, rotated by angle degrees.
+def ruled_page(angle):
+    img = np.full((2200, 1700, 3), 255, np.uint8)
+    for (x0, y0, rows, cols, cw, rh) in ((200, 200, 6, 5, 180, 60), (260, 900, 8, 4, 170, 55)):
+        for i in range(rows + 1):
+            cv2.line(img, (x0, y0 + i * rh), (x0 + cols * cw, y0 + i * rh), (0, 0, 0), 2)
+        for j in range(cols + 1):
+            cv2.line(img, (x0 + j * cw, y0), (x0 + j * cw, y0 + rows * rh), (0, 0, 0), 2)
+    rotation = cv2.getRotationMatrix2D((850, 1100), angle, 1.0)
+    return cv2.warpAffine(img, rotation, (1700, 2200), borderValue=(255, 255, 255))
+
+def line_masks(img):
+    params      = DetectionParams()
+    filtered    = process.threshold_image(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), params)
+    horizontal  = filtered.copy()
+    utils.isolate_lines(horizontal, utils.line_structure(params.horizontal_size(horizontal.shape[1]), horizontal=True))
+    vertical    = filtered.copy()
+    utils.isolate_lines(vertical, utils.line_structure(params.vertical_size(vertical.shape[0]), horizontal=False))
+    return horizontal, vertical
+
+def page_joints(table):
+    return sorted((int(x) + table.x, int(y) + table.y) for row in table.joints for (x, y) in row)
+
+@pytest.mark.parametrize('angle', [0.0, 0.3, -0.5, 1.0])
+def test_segments_engine_matches_mask_engine(angle):
+    horizontal, vertical = line_masks(ruled_page(angle))
+    mask_tables     = sorted(process.find_tables(horizontal, vertical, ENGINE_MASK), key=lambda t: (t.y, t.x))
+    segment_tables  = sorted(process.find_tables(horizontal, vertical, ENGINE_SEGMENTS, process.find_line_rects(horizontal)), key=lambda t: (t.y, t.x))
+
+    assert len(mask_tables) == 2
+    assert len(segment_tables) == len(mask_tables)
+    for mask_table, segment_table in zip(mask_tables, segment_tables):
+        # The mask engine takes the rect of the approximated contour
+        assert abs(mask_table.x - segment_table.x) <= utils.EPSILON
+        assert abs(mask_table.y - segment_table.y) <= utils.EPSILON
+        assert abs(mask_table.x + mask_table.w - segment_table.x - segment_table.w) <= utils.EPSILON
+        assert abs(mask_table.y + mask_table.h - segment_table.y - segment_table.h) <= utils.EPSILON
+
+        # Same joints on the page, a joint on the border of the approximated
+        # rect can lose its first pixel in the mask engine
+        mask_joints     = page_joints(mask_table)
+        segment_joints  = page_joints(segment_table)
+        assert len(segment_joints) == len(mask_joints)
+        for (x, y) in mask_joints:
+            assert min(max(abs(x - sx), abs(y - sy)) for (sx, sy) in segment_joints) <= 1
+
+def test_segments_engine_reuses_line_rects():
+    horizontal, vertical = line_masks(ruled_page(0.3))
+    traced  = segments.find_table_joints(horizontal, vertical)
+    reused  = segments.find_table_joints(horizontal, vertical, process.find_line_rects(horizontal))
+    assert [rect for (rect, joints) in traced] == [rect for (rect, joints) in reused]
+    for (_, traced_joints), (_, reused_joints) in zip(traced, reused):
+        assert (traced_joints == reused_joints).all()
+
+def test_label_components():
+    labels = segments.label_components(7, [0, 2, 3, 6], [1, 3, 4, 5])
+    assert labels[0] == labels[1]
+    assert labels[2] == labels[3] == labels[4]
+    assert labels[5] == labels[6]
+    assert len(set(labels.tolist())) == 3
+    assert segments.label_components(3, [], []).tolist() == [0, 1, 2]